@@ -7,8 +7,123 @@ import logging
 
 log = logging.getLogger(__name__)
 
+
+def _has_top_level_branch(pattern):
+    """Check if a pattern has an alternation outside of any group
+
+    Args:
+      pattern (str): Regex pattern
+    Returns:
+      True when the pattern contains a top level ``|``.
+    """
+    depth = 0
+    in_class = False
+    chars = iter(pattern)
+    for c in chars:
+        if c == '\\':
+            next(chars, None)  # Skip the escaped character
+        elif in_class:
+            if c == ']':
+                in_class = False
+        elif c == '[':
+            in_class = True
+            # A leading ']' (optionally after '^') is part of the class
+            c = next(chars, None)
+            if c == '^':
+                c = next(chars, None)
+            if c == '\\':
+                next(chars, None)
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return True
+    return False
+
+
+def _has_group_references(pattern):
+    """Check if a pattern refers to its own groups by number or name
+
+    Args:
+      pattern (str): Regex pattern
+    Returns:
+      True when the pattern has backreferences or conditional groups.
+    """
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            escaped = pattern[i+1:i+2]
+            if escaped and escaped in '123456789':
+                return True
+            i += 2
+            continue
+        if pattern.startswith('(?P=', i) or pattern.startswith('(?(', i):
+            return True
+        i += 1
+    return False
+
+
+def _can_merge(pat, flags):
+    """Check if a rule can be merged into an alternation with other rules
+
+    Args:
+      pat (re.Pattern): Compiled regex pattern
+      flags (int): Regex flags the lexer was created with
+    Returns:
+      False when the rule depends on its own group numbering, has named groups that
+      could clash with other rules, or sets inline flags for the whole pattern.
+    """
+    if pat.groupindex or _has_group_references(pat.pattern):
+        return False
+    return pat.flags == re.compile('', flags).flags
+
+
+def _first_chars(pat):
+    """Find the characters a pattern can start matching with
+
+    Only patterns beginning with a literal character and without a top level
+    alternation are analyzed. Verbose patterns are skipped since whitespace
+    and comments in them are not literals.
+
+    Args:
+      pat (re.Pattern): Compiled regex pattern
+    Returns:
+      Set of possible first characters or None when they can't be determined.
+    """
+    pattern, flags = pat.pattern, pat.flags
+    if flags & re.VERBOSE:  # Also set by an inline (?x)
+        return None
+
+    if pattern[:1] == '\\':
+        # Escaped punctuation is a literal while escapes like \s or \b are not
+        first, rest = pattern[1:2], pattern[2:]
+        if not first or first.isalnum():
+            return None
+    else:
+        first, rest = pattern[:1], pattern[1:]
+        if not first or first in '.^$*+?{}[]|()':
+            return None
+
+    if rest[:1] in ('*', '?', '{'):  # Optional first character
+        return None
+
+    if _has_top_level_branch(pattern):  # Other branches can start differently
+        return None
+
+    if flags & re.IGNORECASE:
+        return {first.lower(), first.upper()}
+    return {first}
+
 class MiniLexer():
-    """Simple lexer state machine with regex matching rules"""
+    """Simple lexer state machine with regex matching rules
+
+    The rules of a state are merged into one regex. Rules with backreferences,
+    named groups or inline flags for the whole pattern can't be merged since
+    they depend on their own group numbering or flags. A state containing any
+    such rule is matched one rule at a time instead, which is slower.
+    """
 
     def __init__(self, tokens, flags=re.MULTILINE):
         """Create a new lexer
@@ -19,9 +134,12 @@ class MiniLexer():
         """
         self.tokens = {}
 
-        # Pre-process the state definitions
+        # Pre-process the state definitions. The rules for each state are merged into a
+        # single alternation so that one regex call replaces a Python loop over every rule.
+        # Each rule is wrapped in a named group and the group that closed last identifies
+        # the rule that matched.
         for state, patterns in tokens.items():
-            full_patterns = []
+            compiled = []
             for p in patterns:
                 pat = re.compile(p[0], flags)
                 action = p[1]
@@ -36,8 +154,52 @@ class MiniLexer():
                     except IndexError:
                         new_state = -1
 
-                full_patterns.append((pat, action, new_state))
-            self.tokens[state] = full_patterns
+                compiled.append((pat, action, new_state))
+
+            if not all(_can_merge(pat, flags) for pat, _, _ in compiled):
+                self.tokens[state] = (None, compiled)
+                continue
+
+            alternatives = []
+            rules = {}
+            group_index = 1
+            first_chars = set()
+            for i, (pat, action, new_state) in enumerate(compiled):
+                alternatives.append(f'(?P<t{i}>{pat.pattern})')
+                if first_chars is not None:
+                    rule_chars = _first_chars(pat)
+                    first_chars = first_chars | rule_chars if rule_chars is not None else None
+                # Slice of m.groups() holding the rule's own groups, which follow the wrapper
+                rules[group_index] = (action, new_state, group_index, group_index + pat.groups)
+                group_index += 1 + pat.groups
+
+            combined = '|'.join(alternatives)
+            if first_chars:
+                # When every rule begins with a literal, a lookahead on the possible first
+                # characters lets the search skip other positions without trying each rule
+                char_class = ''.join(re.escape(c) for c in sorted(first_chars))
+                combined = f'(?=[{char_class}])(?:{combined})'
+
+            self.tokens[state] = (re.compile(combined, flags), rules)
+
+    @staticmethod
+    def _search_rules(rules, text, pos):
+        """Find the next match of a state that couldn't be merged into one regex
+
+        Args:
+          rules (list): Compiled rules of the state
+          text (str): Text to search
+          pos (int): Position to start searching from
+        Returns:
+          Tuple of the match, action and new state of the earliest matching rule.
+          The first rule wins when several match at the same position.
+        """
+        best = (None, None, None)
+        for pat, action, new_state in rules:
+            m = pat.search(text, pos)
+            if m and (best[0] is None or m.start() < best[0].start()):
+                best = (m, action, new_state)
+        return best
 
     def run(self, text):
         """Run lexer rules against a source text
@@ -52,34 +214,36 @@ class MiniLexer():
         stack = ['root']
         pos = 0
 
-        patterns = self.tokens[stack[-1]]
+        # The loop runs once per token so lookups are hoisted out of it
+        tokens = self.tokens
+        debug = log.isEnabledFor(logging.DEBUG)
+        pattern, rules = tokens['root']
 
         while True:
-            for pat, action, new_state in patterns:
-                m = pat.match(text, pos)
-                if m:
-                    if action:
-                        log.debug("Match: %s -> %s", m.group().strip(), action)
-
-                        yield (pos, m.end() - 1), action, m.groups()
+            # Searching lets the regex engine skip over text that no rule matches
+            # instead of advancing one character at a time in Python
+            if pattern is None:
+                m, action, new_state = self._search_rules(rules, text, pos)
+                if not m:
+                    break
+                groups_start, groups_end = 0, None
+            else:
+                m = pattern.search(text, pos)
+                if not m:
+                    break
+                action, new_state, groups_start, groups_end = rules[m.lastindex]
 
-                    pos = m.end()
+            start, pos = m.span()
+            if action:
+                if debug:
+                    log.debug("Match: %s -> %s", m.group().strip(), action)
 
-                    if new_state:
-                        if isinstance(new_state, int):  # Pop states
-                            del stack[new_state:]
-                        else:
-                            stack.append(new_state)
+                yield (start, pos - 1), action, m.groups()[groups_start:groups_end]
 
-                        patterns = self.tokens[stack[-1]]
+            if new_state:
+                if isinstance(new_state, int):  # Pop states
+                    del stack[new_state:]
+                else:
+                    stack.append(new_state)
 
-                    break
-
-            else:
-                try:
-                    if text[pos] == '\n':
-                        pos += 1
-                        continue
-                    pos += 1
-                except IndexError:
-                    break
+                pattern, rules = tokens[stack[-1]]
@@ -3,14 +3,25 @@
 # Distributed under the terms of the MIT license
 """VHDL documentation parser"""
 import ast
+import concurrent.futures
+import functools
+import hashlib
 import io
+import itertools
+import json
 import os
+import pickle
 import re
-from pprint import pprint
-from typing import Any, Dict, List, Optional, Set
+import sys
+import tempfile
+from typing import Any, Dict, FrozenSet, List, Optional, Set
 from .minilexer import MiniLexer
 
 
+# Consecutive plain comment lines are skipped with a single match. Metacomments
+# end the run so that states handling them still see each one.
+_comment_lines = r'--.*\n(?:\s*--(?!#).*\n)*'
+
 vhdl_tokens = {
     'root': [
         (r'package\s+(\w+)\s+is', 'package', 'package'),
@@ -24,7 +35,7 @@ vhdl_tokens = {
         (r'subtype\s+(\w+)\s+is\s+(\w+)', 'subtype'),
         (r'type\s+(\w+)\s*is', 'type', 'type_decl'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'package': [
         (r'function\s+(\w+|"[^"]+")\s*\(', 'function', 'param_list'),
@@ -37,13 +48,13 @@ vhdl_tokens = {
         (r'end\s+\w+\s*;', None, '#pop'),
         (r'--#(.*)\n', 'metacomment'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'package_body': [
         (r'end\s+\w+\s*;', None, '#pop'),
         (r'--#(.*)\n', 'metacomment'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'type_decl': [
         (r'array', 'array_type', '#pop'),
@@ -54,14 +65,14 @@ vhdl_tokens = {
         (r'\(', 'enum_type', '#pop'),
         (r';', 'incomplete_type', '#pop'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'param_list': [
         (r'\s*((?:variable|signal|constant|file)\s+)?(\w+)\s*', 'param'),
         (r'\s*,\s*', None),
         (r'\s*:\s*', None, 'param_type'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'param_type': [
         (r'\s*((?:in|out|inout|buffer)\s+)?(\w+)\s*', 'param_type'),
@@ -70,33 +81,33 @@ vhdl_tokens = {
         (r'\)\s*(?:return\s+(\w+)\s*)?;', 'end_subprogram', '#pop:2'),
         (r'\)\s*(?:return\s+(\w+)\s*)?is', None, '#pop:2'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'simple_func': [
         (r'\s+return\s+(\w+)\s*;', 'end_subprogram', '#pop'),
         (r'\s+return\s+(\w+)\s+is', None, '#pop'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'component': [
         (r'generic\s*\(', None, 'generic_list'),
         (r'port\s*\(', None, 'port_list'),
         (r'end\s+component\s*\w*;', 'end_component', '#pop'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'entity': [
         (r'generic\s*\(', None, 'generic_list'),
         (r'port\s*\(', None, 'port_list'),
         (r'end\s+\w+\s*;', 'end_entity', '#pop'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'architecture': [
         (r'end\s+\w+\s*;', 'end_arch', '#pop'),
         (r'/\*', 'block_comment', 'block_comment'),
         (r'type\s+(\w+)\s*is', 'type', 'type_decl'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'generic_list': [
         (r'\s*(\w+)\s*', 'generic_param'),
@@ -104,7 +115,7 @@ vhdl_tokens = {
         (r'\s*:\s*', None, 'generic_param_type'),
         (r'--#(.*)\n', 'metacomment'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'generic_param_type': [
         (r'\s*(\w+)[ \t\r\f\v]*', 'generic_param_type'),
@@ -116,7 +127,7 @@ vhdl_tokens = {
         (r'\)\s*;', 'end_generic', '#pop:2'),
         (r'--#(.*)\n', 'metacomment'),
         (r'/\*', 'block_comment', 'block_comment'),
-        (r'--.*\n', None),
+        (_comment_lines, None),
     ],
     'port_list': [
         (r'\s*(\w+)\s*', 'port_param'),
@@ -142,14 +153,14 @@ vhdl_tokens = {
         (r'/\*', 'block_comment', 'block_comment'),
     ],
     'array_range': [
-        (r'\(', 'open_paren', 'nested_parens'),
+        (r'\(', None, 'nested_parens'),
         (r'\s*([\w\+\-\*/\s]+)(\s+(?:down)?to)\s+([\w\+\-\*/\s]+)', 'array_range_val'),
         (r'\)', 'array_range_end', '#pop'),
     ],
     'nested_parens': [
-        (r'\(', 'open_paren', 'nested_parens'),
+        (r'\(', None, 'nested_parens'),
         (r'\s*([\w\+\-\*/\s]+)(\s+(?:down)?to)\s+([\w\+\-\*/\s]+)', 'array_range_val'),
-        (r'\)', 'close_paren', '#pop'),
+        (r'\)', None, '#pop'),
     ],
     'block_comment': [
         (r'\*/', 'end_comment', '#pop'),
@@ -158,6 +169,10 @@ vhdl_tokens = {
 
 VhdlLexer = MiniLexer(vhdl_tokens, flags=re.MULTILINE | re.IGNORECASE)
 
+# Helper patterns used outside of the lexer
+_metacomment_prefix = re.compile(r'^#+')
+_flat_parenthesis = re.compile(r'\([^()]*\)')
+
 
 class VhdlObject:
     """Base class for parsed VHDL objects
@@ -167,6 +182,8 @@ class VhdlObject:
       desc (str): Description from object metacomments
     """
 
+    __slots__ = ('name', 'kind', 'desc')
+
     def __init__(self, name, desc=None):
         self.name = name
         self.kind = 'unknown'
@@ -177,7 +194,7 @@ def remove_outer_parenthesis(s: Optional[str]):
     if s:
         n = 1
         while n:
-            s, n = re.subn(r'\([^()]*\)', '', s.strip())  # remove non-nested/flat balanced parts
+            s, n = _flat_parenthesis.subn('', s.strip())  # remove non-nested/flat balanced parts
     return s
 
 
@@ -192,6 +209,8 @@ class VhdlParameterType:
       arange (str): Original array range string
     """
 
+    __slots__ = ('name', 'direction', 'r_bound', 'l_bound', 'arange')
+
     def __init__(self, name, direction="", r_bound="", l_bound="", arange=""):
         self.name = name
         self.direction = direction.lower().strip()
@@ -215,6 +234,8 @@ class VhdlParameter:
       param_desc (optional str): Description of the parameter
     """
 
+    __slots__ = ('name', 'mode', 'data_type', 'default_value', 'desc', 'param_desc')
+
     def __init__(self, name, mode: Optional[str] = None, data_type: Optional[VhdlParameterType] = None, default_value: Optional[str] = None, desc: Optional[str] = None):
         self.name = name
         self.mode = mode
@@ -249,6 +270,8 @@ class VhdlPackage(VhdlObject):
       desc (str): Description from object metacomments
     """
 
+    __slots__ = ()
+
     def __init__(self, name, desc=None):
         VhdlObject.__init__(self, name, desc)
         self.kind = 'package'
@@ -264,6 +287,8 @@ class VhdlType(VhdlObject):
       desc (str, optional): Description from object metacomments
     """
 
+    __slots__ = ('package', 'type_of')
+
     def __init__(self, name, package, type_of, desc=None):
         VhdlObject.__init__(self, name, desc)
         self.kind = 'type'
@@ -284,6 +309,8 @@ class VhdlSubtype(VhdlObject):
       desc (str, optional): Description from object metacomments
     """
 
+    __slots__ = ('package', 'base_type')
+
     def __init__(self, name, package, base_type, desc=None):
         VhdlObject.__init__(self, name, desc)
         self.kind = 'subtype'
@@ -304,6 +331,8 @@ class VhdlConstant(VhdlObject):
       desc (str, optional): Description from object metacomments
     """
 
+    __slots__ = ('package', 'base_type')
+
     def __init__(self, name, package, base_type, desc=None):
         VhdlObject.__init__(self, name, desc)
         self.kind = 'constant'
@@ -325,12 +354,17 @@ class VhdlFunction(VhdlObject):
       desc (str, optional): Description from object metacomments
     """
 
+    __slots__ = ('package', 'parameters', 'return_type', '_proto', '_sigs')
+
     def __init__(self, name, package, parameters, return_type=None, desc=None):
         VhdlObject.__init__(self, name, desc)
         self.kind = 'function'
         self.package = package
         self.parameters = parameters
         self.return_type = return_type
+        # Rendered by subprogram_prototype() and subprogram_signature()
+        self._proto = None
+        self._sigs = None
 
     def __repr__(self):
         return f"VhdlFunction('{self.name}')"
@@ -346,11 +380,16 @@ class VhdlProcedure(VhdlObject):
       desc (str, optional): Description from object metacomments
     """
 
+    __slots__ = ('package', 'parameters', '_proto', '_sigs')
+
     def __init__(self, name, package, parameters, desc=None):
         VhdlObject.__init__(self, name, desc)
         self.kind = 'procedure'
         self.package = package
         self.parameters = parameters
+        # Rendered by subprogram_prototype() and subprogram_signature()
+        self._proto = None
+        self._sigs = None
 
     def __repr__(self):
         return f"VhdlProcedure('{self.name}')"
@@ -367,6 +406,8 @@ class VhdlEntity(VhdlObject):
       desc (str, optional): Description from object metacomments
     """
 
+    __slots__ = ('generics', 'ports', 'sections')
+
     def __init__(self, name: str, ports: List[VhdlParameter], generics: Optional[List[VhdlParameter]] = None, sections: Optional[List[str]] = None, desc: Optional[str] = None):
         VhdlObject.__init__(self, name, desc)
         self.kind = 'entity'
@@ -395,6 +436,8 @@ class VhdlComponent(VhdlObject):
       desc (str, optional): Description from object metacomments
     """
 
+    __slots__ = ('package', 'generics', 'ports', 'sections')
+
     def __init__(self, name, package, ports, generics=None, sections=None, desc=None):
         VhdlObject.__init__(self, name, desc)
         self.kind = 'component'
@@ -425,6 +468,328 @@ def parse_vhdl_file(fname):
     return parse_vhdl(text)
 
 
+class _VhdlParseState:
+    """Mutable state shared by the parser actions while scanning a text buffer
+
+    Args:
+      text (str): Source code being parsed
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+        self.name = None
+        self.kind = None
+        self.saved_type = None
+        self.end_param_group = False
+        self.cur_package = None
+
+        self.metacomments = []
+        self.parameters = []
+        self.param_items = []
+        # Attributes shared by the pending subprogram parameters in param_items
+        self.param_mode = None
+        self.param_type = None
+        self.param_default = None
+
+        self.generics = []
+        self.ports = []
+        self.sections = {}
+        self.port_param_index = 0
+        self.last_items = []
+        self.array_range_start_pos = 0
+
+        # Values carried between consecutive actions
+        self.mode = None
+        self.ptype = None
+        self.l_bound = None
+        self.direction = None
+        self.r_bound = None
+
+        self.objects = []
+
+
+def _action_metacomment(st, pos, groups):
+    realigned = _metacomment_prefix.sub(lambda m: ' ' * len(m.group(0)), groups[0])
+    if not st.last_items:
+        st.metacomments.append(realigned)
+    else:
+        for i in st.last_items:
+            i.desc = realigned
+
+
+def _action_section_meta(st, pos, groups):
+    st.sections[st.port_param_index] = groups[0]
+
+
+def _complete_params(st):
+    """Create the pending subprogram parameters from their shared attributes"""
+    mode, ptype, default = st.param_mode, st.param_type, st.param_default
+    st.parameters.extend([VhdlParameter(i, mode, ptype, default) for i in st.param_items])
+
+    st.param_items = []
+    st.param_mode = st.param_type = st.param_default = None
+
+
+def _action_function(st, pos, groups):
+    st.kind = 'function'
+    st.name = groups[0]
+    st.param_items = []
+    st.parameters = []
+    st.param_mode = st.param_type = st.param_default = None
+
+
+def _action_procedure(st, pos, groups):
+    st.kind = 'procedure'
+    st.name = groups[0]
+    st.param_items = []
+    st.parameters = []
+    st.param_mode = st.param_type = st.param_default = None
+
+
+def _action_param(st, pos, groups):
+    if st.end_param_group:
+        # Complete previous parameters
+        _complete_params(st)
+        st.end_param_group = False
+
+    st.param_items.append(groups[1])
+
+
+def _action_param_type(st, pos, groups):
+    mode, ptype = groups
+
+    if mode is not None:
+        mode = mode.strip()
+
+    # Set mode and type for all pending parameters
+    st.param_mode = mode
+    st.param_type = sys.intern(ptype)
+
+    st.end_param_group = True
+
+
+def _action_param_default(st, pos, groups):
+    st.param_default = groups[0]
+
+
+def _action_end_subprogram(st, pos, groups):
+    # Complete last parameters
+    _complete_params(st)
+
+    if st.kind == 'function':
+        vobj = VhdlFunction(st.name, st.cur_package, st.parameters, groups[0], st.metacomments)
+    else:
+        vobj = VhdlProcedure(st.name, st.cur_package, st.parameters, st.metacomments)
+
+    st.objects.append(vobj)
+
+    st.metacomments = []
+    st.parameters = []
+    st.param_items = []
+    st.kind = None
+    st.name = None
+
+
+def _action_entity(st, pos, groups):
+    st.kind = 'entity'
+    st.name = groups[0]
+    st.generics = []
+    st.ports = []
+    st.param_items = []
+    st.sections = {}
+    st.port_param_index = 0
+
+
+def _action_component(st, pos, groups):
+    st.kind = 'component'
+    st.name = groups[0]
+    st.generics = []
+    st.ports = []
+    st.param_items = []
+    st.sections = {}
+    st.port_param_index = 0
+
+
+def _action_generic_param(st, pos, groups):
+    st.param_items.append(groups[0])
+
+
+def _action_generic_param_type(st, pos, groups):
+    st.ptype = sys.intern(groups[0])
+    st.last_items = [VhdlParameter(i, 'in', VhdlParameterType(st.ptype)) for i in st.param_items]
+    st.generics.extend(st.last_items)
+
+    st.param_items = []
+
+
+def _action_param_item_default(st, pos, groups):
+    for i in st.last_items:
+        i.default_value = groups[0]
+
+
+def _action_port_param(st, pos, groups):
+    st.param_items.append(groups[0])
+    st.port_param_index += 1
+
+
+def _action_port_param_type(st, pos, groups):
+    st.mode, ptype = groups
+    st.ptype = sys.intern(ptype)
+
+    st.last_items = [VhdlParameter(i, st.mode, VhdlParameterType(st.ptype)) for i in st.param_items]
+    st.ports.extend(st.last_items)
+
+    st.param_items = []
+
+
+def _action_port_array_param_type(st, pos, groups):
+    st.mode, ptype = groups
+    st.ptype = sys.intern(ptype)
+    st.array_range_start_pos = pos[1]
+
+
+@functools.lru_cache(maxsize=1024)
+def _eval_bound(bound):
+    """Evaluate a constant array bound expression
+
+    Bounds repeat across ports so results are cached rather than compiling the
+    expression again for every occurrence.
+
+    Args:
+      bound (str): Bound expression from an array range
+    Returns:
+      Value of the expression or the expression itself when it is not constant.
+    """
+    bound = bound.replace("/", "//")
+    try:
+        return eval(bound)
+    except Exception:
+        return bound
+
+
+def _action_array_range_val(st, pos, groups):
+    l_bound, direction, r_bound = groups
+    if direction:
+        direction = direction.strip()
+    if l_bound:
+        l_bound = _eval_bound(l_bound)
+    if r_bound:
+        r_bound = _eval_bound(r_bound)
+    st.l_bound, st.direction, st.r_bound = l_bound, direction, r_bound
+
+
+def _action_array_range_end(st, pos, groups):
+    if st.l_bound and st.r_bound and st.direction:
+        arange = " ".join([st.l_bound, st.direction, st.r_bound])
+    else:
+        arange = st.text[st.array_range_start_pos:pos[0] + 1]
+    # arange = arange.strip().lstrip("(")
+    # match = re.match("\s*\(?\s*(.*)\s+(downto|to)\s+(.*)\s*\)\s*", arange, re.IGNORECASE)
+    # if match:
+    #     print("------", match.groups())
+    #     arange = " ".join(match.groups())
+
+    st.last_items = [
+        VhdlParameter(i, st.mode, VhdlParameterType(st.ptype, st.direction, st.r_bound, st.l_bound, arange))
+        for i in st.param_items
+    ]
+    st.ports.extend(st.last_items)
+
+    st.param_items = []
+
+
+def _action_end_entity(st, pos, groups):
+    vobj = VhdlEntity(st.name, st.ports, st.generics, st.sections, st.metacomments)
+    st.objects.append(vobj)
+    st.last_items = []
+    st.metacomments = []
+
+
+def _action_end_component(st, pos, groups):
+    vobj = VhdlComponent(st.name, st.cur_package, st.ports, st.generics, st.sections, st.metacomments)
+    st.objects.append(vobj)
+    st.last_items = []
+    st.metacomments = []
+
+
+def _action_package(st, pos, groups):
+    st.objects.append(VhdlPackage(groups[0]))
+    st.cur_package = groups[0]
+    st.kind = None
+    st.name = None
+
+
+def _action_type(st, pos, groups):
+    st.saved_type = groups[0]
+
+
+def _action_type_of(st, pos, groups, type_of):
+    vobj = VhdlType(st.saved_type, st.cur_package, type_of, st.metacomments)
+    st.objects.append(vobj)
+    st.kind = None
+    st.name = None
+    st.metacomments = []
+
+
+def _action_subtype(st, pos, groups):
+    vobj = VhdlSubtype(groups[0], st.cur_package, groups[1], st.metacomments)
+    st.objects.append(vobj)
+    st.kind = None
+    st.name = None
+    st.metacomments = []
+
+
+def _action_constant(st, pos, groups):
+    vobj = VhdlConstant(groups[0], st.cur_package, groups[1], st.metacomments)
+    st.objects.append(vobj)
+    st.kind = None
+    st.name = None
+    st.metacomments = []
+
+
+def _action_line_comment(st, pos, groups):
+    for i in st.last_items:
+        if not i.param_desc:
+            i.param_desc = groups[0]
+
+
+# Lexer actions that complete a type declaration
+_TYPE_ACTIONS = {'array_type', 'file_type', 'access_type', 'record_type', 'range_type', 'enum_type', 'incomplete_type'}
+
+# Parser handlers for each lexer action. Actions without an entry are ignored.
+_ACTIONS = {
+    'metacomment': _action_metacomment,
+    'section_meta': _action_section_meta,
+    'function': _action_function,
+    'procedure': _action_procedure,
+    'param': _action_param,
+    'param_type': _action_param_type,
+    'param_default': _action_param_default,
+    'end_subprogram': _action_end_subprogram,
+    'entity': _action_entity,
+    'component': _action_component,
+    'generic_param': _action_generic_param,
+    'generic_param_type': _action_generic_param_type,
+    'generic_param_default': _action_param_item_default,
+    'port_param': _action_port_param,
+    'port_param_type': _action_port_param_type,
+    'port_param_default': _action_param_item_default,
+    'port_array_param_type': _action_port_array_param_type,
+    'array_range_val': _action_array_range_val,
+    'array_range_end': _action_array_range_end,
+    'end_entity': _action_end_entity,
+    'end_component': _action_end_component,
+    'package': _action_package,
+    'type': _action_type,
+    'subtype': _action_subtype,
+    'constant': _action_constant,
+    'line_comment': _action_line_comment,
+}
+for _type_action in _TYPE_ACTIONS:
+    _ACTIONS[_type_action] = functools.partial(_action_type_of, type_of=_type_action)
+
+
 def parse_vhdl(text):
     """Parse a text buffer of VHDL code
 
@@ -433,245 +798,77 @@ def parse_vhdl(text):
     Returns:
       Parsed objects.
     """
-    lex = VhdlLexer
-
-    name = None
-    kind = None
-    saved_type = None
-    end_param_group = False
-    cur_package = None
-
-    metacomments = []
-    parameters = []
-    param_items = []
-
-    generics = []
-    ports = []
-    sections = []
-    port_param_index = 0
-    last_items = []
-    array_range_start_pos = 0
-
-    objects = []
-
-    for pos, action, groups in lex.run(text):
-        if action == 'metacomment':
-            realigned = re.sub(r'^#+', lambda m: ' ' * len(m.group(0)), groups[0])
-            if not last_items:
-                metacomments.append(realigned)
-            else:
-                for i in last_items:
-                    i.desc = realigned
-        if action == 'section_meta':
-            sections.append((port_param_index, groups[0]))
-
-        elif action == 'function':
-            kind = 'function'
-            name = groups[0]
-            param_items = []
-            parameters = []
-        elif action == 'procedure':
-            kind = 'procedure'
-            name = groups[0]
-            param_items = []
-            parameters = []
-        elif action == 'param':
-            if end_param_group:
-                # Complete previous parameters
-                for i in param_items:
-                    parameters.append(i)
-                param_items = []
-                end_param_group = False
-
-            param_items.append(VhdlParameter(groups[1]))
-        elif action == 'param_type':
-            mode, ptype = groups
-
-            if mode is not None:
-                mode = mode.strip()
-
-            for i in param_items:  # Set mode and type for all pending parameters
-                i.mode = mode
-                i.data_type = ptype
-
-            end_param_group = True
-
-        elif action == 'param_default':
-            for i in param_items:
-                i.default_value = groups[0]
-
-        elif action == 'end_subprogram':
-            # Complete last parameters
-            for i in param_items:
-                parameters.append(i)
-
-            if kind == 'function':
-                vobj = VhdlFunction(name, cur_package, parameters, groups[0], metacomments)
-            else:
-                vobj = VhdlProcedure(name, cur_package, parameters, metacomments)
-
-            objects.append(vobj)
-
-            metacomments = []
-            parameters = []
-            param_items = []
-            kind = None
-            name = None
-
-        elif action == 'entity':
-            kind = 'entity'
-            name = groups[0]
-            generics = []
-            ports = []
-            param_items = []
-            sections = []
-            port_param_index = 0
-
-        elif action == 'component':
-            kind = 'component'
-            name = groups[0]
-            generics = []
-            ports = []
-            param_items = []
-            sections = []
-            port_param_index = 0
-
-        elif action == 'generic_param':
-            param_items.append(groups[0])
-
-        elif action == 'generic_param_type':
-            ptype = groups[0]
-            last_items = []
-            for i in param_items:
-                param = VhdlParameter(i, 'in', VhdlParameterType(ptype))
-                generics.append(param)
-                last_items.append(param)
-
-            param_items = []
-
-        elif action == 'generic_param_default':
-            for i in last_items:
-                i.default_value = groups[0]
-
-        elif action == 'port_param':
-            param_items.append(groups[0])
-            port_param_index += 1
-
-        elif action == 'port_param_type':
-            mode, ptype = groups
-
-            last_items = []
-            for i in param_items:
-                param = VhdlParameter(i, mode, VhdlParameterType(ptype))
-                ports.append(param)
-                last_items.append(param)
-
-            param_items = []
-
-        elif action == 'port_param_default':
-            for i in last_items:
-                i.default_value = groups[0]
-
-        elif action == 'port_array_param_type':
-            mode, ptype = groups
-            array_range_start_pos = pos[1]
-
-        elif action == 'array_range_val':
-            l_bound, direction, r_bound = groups
-            if direction:
-                direction = direction.strip()
-            if l_bound:
-                try:
-                    l_bound = l_bound.replace("/", "//")
-                    l_bound = eval(l_bound)
-                except Exception:
-                    pass
-            if r_bound:
-                try:
-                    r_bound = r_bound.replace("/", "//")
-                    r_bound = eval(r_bound)
-                except Exception:
-                    pass
+    st = _VhdlParseState(text)
+    actions = _ACTIONS
+
+    for pos, action, groups in VhdlLexer.run(text):
+        handler = actions.get(action)
+        if handler is not None:
+            handler(st, pos, groups)
+
+    return st.objects
 
-        elif action == 'array_range_end':
-            if l_bound and r_bound and direction:
-                arange = " ".join([l_bound, direction, r_bound])
-            else:
-                arange = text[array_range_start_pos:pos[0] + 1]
-            # arange = arange.strip().lstrip("(")
-            # match = re.match("\s*\(?\s*(.*)\s+(downto|to)\s+(.*)\s*\)\s*", arange, re.IGNORECASE)
-            # if match:
-            #     print("------", match.groups())
-            #     arange = " ".join(match.groups())
-
-            last_items = []
-            for i in param_items:
-                param = VhdlParameter(i, mode, VhdlParameterType(ptype, direction, r_bound, l_bound, arange))
-                ports.append(param)
-                last_items.append(param)
-
-            param_items = []
-
-        elif action == 'end_entity':
-            vobj = VhdlEntity(name, ports, generics, dict(sections), metacomments)
-            objects.append(vobj)
-            last_items = []
-            metacomments = []
-
-        elif action == 'end_component':
-            vobj = VhdlComponent(name, cur_package, ports, generics, dict(sections), metacomments)
-            objects.append(vobj)
-            last_items = []
-            metacomments = []
-
-        elif action == 'package':
-            objects.append(VhdlPackage(groups[0]))
-            cur_package = groups[0]
-            kind = None
-            name = None
-
-        elif action == 'type':
-            saved_type = groups[0]
-
-        elif action in (
-                'array_type', 'file_type', 'access_type', 'record_type', 'range_type', 'enum_type', 'incomplete_type'):
-            vobj = VhdlType(saved_type, cur_package, action, metacomments)
-            objects.append(vobj)
-            kind = None
-            name = None
-            metacomments = []
-
-        elif action == 'subtype':
-            vobj = VhdlSubtype(groups[0], cur_package, groups[1], metacomments)
-            objects.append(vobj)
-            kind = None
-            name = None
-            metacomments = []
-
-        elif action == 'constant':
-            vobj = VhdlConstant(groups[0], cur_package, groups[1], metacomments)
-            objects.append(vobj)
-            kind = None
-            name = None
-            metacomments = []
-
-        elif action == 'line_comment':
-            for i in last_items:
-                if not i.param_desc:
-                    i.param_desc = groups[0]
-
-    return objects
+
+def _parse_vhdl_source_file(fname):
+    """Parse a VHDL file read the same way as VhdlExtractor
+
+    This is a module-level function so that it can run in worker processes.
+
+    Args:
+      fname(str): Name of file to parse
+    Returns:
+      Parsed objects.
+    """
+    with io.open(fname, 'rt', encoding='latin-1') as fh:
+        text = fh.read()
+    return parse_vhdl(text)
+
+
+def _intern_type_names(objects):
+    """Intern the type names of parameters, generics, and ports
+
+    Unpickling doesn't preserve interning, so objects loaded from the disk cache or
+    returned by worker processes only share type names within their own file.
+
+    Args:
+      objects (list of VhdlObject): Parsed objects
+    """
+    for o in objects:
+        if isinstance(o, (VhdlFunction, VhdlProcedure)):
+            for p in o.parameters:
+                if p.data_type is not None:
+                    p.data_type = sys.intern(p.data_type)
+        elif isinstance(o, (VhdlEntity, VhdlComponent)):
+            for p in itertools.chain(o.generics, o.ports):
+                p.data_type.name = sys.intern(p.data_type.name)
+
+
+def _source_key(fname):
+    """Identify the current contents of a source file for caching
+
+    Args:
+      fname(str): Name of source file
+    Returns:
+      Tuple of the absolute file name, modification time and size.
+    """
+    st = os.stat(fname)
+    return (os.path.abspath(fname), st.st_mtime_ns, st.st_size)
 
 
 def subprogram_prototype(vo):
     """Generate a canonical prototype string
 
+    The prototype is cached on the object since parsed objects don't change.
+
     Args:
       vo (VhdlFunction, VhdlProcedure): Subprogram object
     Returns:
       Prototype string.
     """
 
+    if vo._proto is not None:
+        return vo._proto
+
     plist = '; '.join(str(p) for p in vo.parameters)
 
     if isinstance(vo, VhdlFunction):
@@ -683,12 +880,15 @@ def subprogram_prototype(vo):
     else:  # procedure
         proto = f"procedure {vo.name}({plist});"
 
+    vo._proto = proto
     return proto
 
 
 def subprogram_signature(vo, fullname=None):
     """Generate a signature string
 
+    Signatures are cached on the object for each name they are generated with.
+
     Args:
       vo (VhdlFunction, VhdlProcedure): Subprogram object
       fullname (None, str): Override object name
@@ -699,6 +899,11 @@ def subprogram_signature(vo, fullname=None):
     if fullname is None:
         fullname = vo.name
 
+    if vo._sigs is None:
+        vo._sigs = {}
+    elif fullname in vo._sigs:
+        return vo._sigs[fullname]
+
     if isinstance(vo, VhdlFunction):
         plist = ','.join(p.data_type for p in vo.parameters)
         sig = f"{fullname}[{plist} return {vo.return_type}]"
@@ -706,6 +911,7 @@ def subprogram_signature(vo, fullname=None):
         plist = ','.join(p.data_type for p in vo.parameters)
         sig = f"{fullname}[{plist}]"
 
+    vo._sigs[fullname] = sig
     return sig
 
 
@@ -720,19 +926,68 @@ def is_vhdl(fname):
     return os.path.splitext(fname)[-1].lower() in ('.vhdl', '.vhd')
 
 
+# Default location of parsed objects cached across runs
+_disk_cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                               'symbolator')
+
+
+@functools.lru_cache(maxsize=None)
+def _parser_fingerprint():
+    """Identify the parser code so cached objects from other versions are ignored
+
+    Returns:
+      Digest of the parser and lexer sources or None when they can't be read.
+    """
+    digest = hashlib.sha1()
+    try:
+        for fname in (__file__, sys.modules[MiniLexer.__module__].__file__):
+            with open(fname, 'rb') as fh:
+                digest.update(fh.read())
+    except (OSError, TypeError):  # Sources not available as files
+        return None
+    return digest.hexdigest()
+
+
 class VhdlExtractor:
     """Utility class that caches parsed objects and tracks array type definitions
 
+    Parsed objects are cached in memory and on disk, keyed on the file's name,
+    modification time and size so edited files are parsed again.
+
     Args:
       array_types(set): Initial array types
+      cache_dir(str, optional): Directory for parsed objects cached across runs.
+        Defaults to ``$XDG_CACHE_HOME/symbolator``, falling back to ``~/.cache/symbolator``.
+        Use None to disable the disk cache.
     """
 
-    def __init__(self, array_types: Set[str] = None):
-        self.array_types = set(('std_ulogic_vector', 'std_logic_vector',
-                                'signed', 'unsigned', 'bit_vector'))
+    def __init__(self, array_types: Set[str] = None, cache_dir: Optional[str] = _disk_cache_dir):
+        self._array_types: FrozenSet[str] = frozenset()
+        # Lowercase copy of array_types and memoized is_array() results
+        self._array_types_lower: Set[str] = set()
+        self._is_array_cache: Dict[str, bool] = {}
+        self._update_array_types({'std_ulogic_vector', 'std_logic_vector', 'signed', 'unsigned', 'bit_vector'})
         if array_types:
-            self.array_types |= array_types
+            self._update_array_types(array_types)
         self.object_cache: Dict[str, Any] = {}  # Any -> VhdlObject
+        self.cache_dir = cache_dir
+        self._cache_keys: Dict[str, tuple] = {}
+
+    @property
+    def array_types(self):
+        """Names of known array types
+
+        The set is read-only. Assign a new set, or use ``|=``, to change it so that
+        :meth:`is_array` sees the update.
+        """
+        return self._array_types
+
+    @array_types.setter
+    def array_types(self, names):
+        self._array_types = frozenset()
+        self._array_types_lower = set()
+        self._is_array_cache.clear()
+        self._update_array_types(names)
 
     def extract_objects(self, fname, type_filter=None):
         """Extract objects from a source file
@@ -744,14 +999,17 @@ class VhdlExtractor:
           List of parsed objects.
         """
         objects = []
-        if fname in self.object_cache:
+        key = _source_key(fname)
+
+        if fname in self.object_cache and self._cache_keys.get(fname) == key:
             objects = self.object_cache[fname]
         else:
-            with io.open(fname, 'rt', encoding='latin-1') as fh:
-                text = fh.read()
-                objects = parse_vhdl(text)
-                self.object_cache[fname] = objects
-                self._register_array_types(objects)
+            objects = self._load_cached_objects(key)
+            if objects is None:
+                objects = _parse_vhdl_source_file(fname)
+                self._save_cached_objects(key, objects)
+
+            self._cache_objects(fname, key, objects)
 
         if type_filter:
             if not isinstance(type_filter, list):
@@ -763,6 +1021,136 @@ class VhdlExtractor:
 
         return objects
 
+    def extract_files_objects(self, fnames, max_workers=1):
+        """Extract objects from several source files, optionally parsing them in parallel
+
+        With more than one worker, files that are not cached are parsed in a pool of
+        worker processes and the results are merged into the cache and array type
+        registry. Scripts using a pool must guard their entry point with
+        ``if __name__ == '__main__'``.
+
+        Args:
+          fnames (list of str): Files to parse
+          max_workers (int, optional): Number of worker processes. Defaults to parsing serially.
+        Returns:
+          Dict of parsed object lists keyed by file name.
+        """
+        results = {}
+        loaded = {}  # Objects not in memory yet, keyed by file name with their source key
+        pending = {}
+        for fname in fnames:
+            if fname in results or fname in loaded or fname in pending:
+                continue
+            key = _source_key(fname)
+            if fname in self.object_cache and self._cache_keys.get(fname) == key:
+                results[fname] = self.object_cache[fname]
+                continue
+
+            objects = self._load_cached_objects(key)
+            if objects is None:
+                pending[fname] = key
+            else:
+                loaded[fname] = (key, objects)
+
+        workers = min(max_workers or 1, len(pending))
+        if workers > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(pending) // (workers * 4))
+                parsed = list(pool.map(_parse_vhdl_source_file, pending, chunksize=chunksize))
+        else:
+            parsed = [_parse_vhdl_source_file(fname) for fname in pending]
+
+        for (fname, key), objects in zip(pending.items(), parsed):
+            self._save_cached_objects(key, objects)
+            loaded[fname] = (key, objects)
+
+        # Register in the order of fnames so the result doesn't depend on what was cached on disk
+        for fname in fnames:
+            if fname in loaded:
+                key, objects = loaded.pop(fname)
+                self._cache_objects(fname, key, objects)
+                results[fname] = objects
+
+        return {fname: results[fname] for fname in fnames}
+
+    def _cache_objects(self, fname, key, objects):
+        """Add objects extracted from a file to the cache and array type registry
+
+        Args:
+          fname (str): File the objects were extracted from
+          key (tuple): Absolute file name, modification time and size of the source
+          objects (list of VhdlObject): Extracted objects
+        """
+        _intern_type_names(objects)
+        self.object_cache[fname] = objects
+        self._cache_keys[fname] = key
+        self._register_array_types(objects)
+
+    def _disk_cache_path(self, key):
+        """Get the disk cache file for a source file
+
+        Each source file has a single entry that is replaced when the file changes.
+
+        Args:
+          key (tuple): Absolute file name, modification time and size of the source
+        Returns:
+          Path of the cache file.
+        """
+        digest = hashlib.sha1(key[0].encode('utf-8', 'surrogateescape')).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.pickle')
+
+    def _load_cached_objects(self, key):
+        """Load previously parsed objects from the disk cache
+
+        Args:
+          key (tuple): Absolute file name, modification time and size of the source
+        Returns:
+          List of parsed objects or None when they are not cached.
+        """
+        fingerprint = _parser_fingerprint()
+        if self.cache_dir is None or fingerprint is None:
+            return None
+
+        try:
+            with open(self._disk_cache_path(key), 'rb') as fh:
+                stamp, objects = pickle.load(fh)
+        except Exception:  # Missing or unreadable cache entry
+            return None
+
+        # Entries for other contents of the file or other parser versions are stale
+        if stamp != (fingerprint, key):
+            return None
+        return objects
+
+    def _save_cached_objects(self, key, objects):
+        """Save parsed objects to the disk cache
+
+        Args:
+          key (tuple): Absolute file name, modification time and size of the source
+          objects (list of VhdlObject): Objects parsed from the source
+        """
+        fingerprint = _parser_fingerprint()
+        if self.cache_dir is None or fingerprint is None:
+            return
+
+        tmp_name = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            with tempfile.NamedTemporaryFile('wb', dir=self.cache_dir, delete=False) as fh:
+                tmp_name = fh.name
+                pickle.dump(((fingerprint, key), objects), fh, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self._disk_cache_path(key))
+            tmp_name = None
+        except Exception:  # Failing to save only costs a parse on the next run
+            pass
+        finally:
+            if tmp_name is not None:
+                try:
+                    os.remove(tmp_name)
+                except OSError:
+                    pass
+
     def extract_objects_from_source(self, text, type_filter=None):
         """Extract object declarations from a text buffer
 
@@ -788,7 +1176,24 @@ class VhdlExtractor:
         Returns:
           True if ``data_type`` is a known array type.
         """
-        return data_type.name.lower() in self.array_types
+        name = data_type.name
+        try:
+            return self._is_array_cache[name]
+        except KeyError:
+            is_array = self._is_array_cache[name] = name.lower() in self._array_types_lower
+            return is_array
+
+    def _update_array_types(self, names):
+        """Add names to the array type registry and its lookup tables
+
+        Args:
+          names (set of str): Array type names
+        """
+        names = set(names) - self._array_types
+        if names:
+            self._array_types = self._array_types | names
+            self._array_types_lower |= {n.lower() for n in names}
+            self._is_array_cache.clear()
 
     def _add_array_types(self, type_defs):
         """Add array data types to internal registry
@@ -797,7 +1202,7 @@ class VhdlExtractor:
           type_defs (dict): Dictionary of type definitions
         """
         if 'arrays' in type_defs:
-            self.array_types |= set(type_defs['arrays'])
+            self._update_array_types(type_defs['arrays'])
 
     def load_array_types(self, fname):
         """Load file of previously extracted data types
@@ -810,9 +1215,13 @@ class VhdlExtractor:
             type_defs = fh.read()
 
         try:
-            type_defs = ast.literal_eval(type_defs)
-        except SyntaxError:
-            type_defs = {}
+            type_defs = json.loads(type_defs)
+        except ValueError:
+            # Files saved by earlier versions hold a Python literal
+            try:
+                type_defs = ast.literal_eval(type_defs)
+            except SyntaxError:
+                type_defs = {}
 
         self._add_array_types(type_defs)
 
@@ -824,7 +1233,7 @@ class VhdlExtractor:
         """
         type_defs = {'arrays': sorted(list(self.array_types))}
         with open(fname, 'wt', encoding='UTF-8') as fh:
-            pprint(type_defs, stream=fh)
+            json.dump(type_defs, fh)
 
     def _register_array_types(self, objects):
         """Add array type definitions to internal registry
@@ -834,27 +1243,38 @@ class VhdlExtractor:
         """
         # Add all array types directly
         types = [o for o in objects if isinstance(o, VhdlType) and o.type_of == 'array_type']
-        for t in types:
-            self.array_types.add(t.name)
+        self._update_array_types({t.name for t in types})
 
         subtypes = {o.name: o.base_type for o in objects if isinstance(o, VhdlSubtype)}
+        roots = {}
+
+        def root(name):
+            """Find the base type at the end of a subtype chain"""
+            chain = []
+            visited = set()
+            while name in subtypes and name not in roots:  # Follow subtypes of subtypes
+                chain.append(name)
+                visited.add(name)
+                name = subtypes[name]
+                if name in visited:  # Circular definition
+                    break
+            base = roots.get(name, name)
+            for n in chain:  # Every subtype on the chain shares the same base
+                roots[n] = base
+            return base
 
         # Find all subtypes of an array type
-        for k, v in subtypes.items():
-            while v in subtypes:  # Follow subtypes of subtypes
-                v = subtypes[v]
-            if v in self.array_types:
-                self.array_types.add(k)
+        self._update_array_types({k for k in subtypes if root(k).lower() in self._array_types_lower})
 
-    def register_array_types_from_sources(self, source_files):
+    def register_array_types_from_sources(self, source_files, max_workers=1):
         """Add array type definitions from a file list to internal registry
 
         Args:
           source_files (list of str): Files to parse for array definitions
+          max_workers (int, optional): Number of worker processes used to parse the files
         """
-        for fname in source_files:
-            if is_vhdl(fname):
-                self._register_array_types(self.extract_objects(fname))
+        vhdl_files = [fname for fname in source_files if is_vhdl(fname)]
+        self.extract_files_objects(vhdl_files, max_workers)
 
 
 if __name__ == '__main__':
@@ -651,7 +651,7 @@ def main():
 
         log.debug(f"Finding array type from following sources: {flist}")
         # Find all of the array types
-        vhdl_ex.register_array_types_from_sources(flist)
+        vhdl_ex.register_array_types_from_sources(flist, max_workers=os.cpu_count())
         log.debug(f"Discovered VHDL array types: {vhdl_ex.array_types}")
 
     if args.save_lib:
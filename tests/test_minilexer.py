@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Distributed under the terms of the MIT license
+"""Regression tests for the MiniLexer rule merging"""
+import re
+import unittest
+
+from hdlparse.minilexer import MiniLexer
+
+
+def _actions(lexer, text):
+    return [action for _, action, _ in lexer.run(text)]
+
+
+class TestFirstCharPrefilter(unittest.TestCase):
+
+    def test_verbose_flag(self):
+        lexer = MiniLexer({'root': [(r' a  (\d)', 'A'), (r'b', 'B')]}, re.VERBOSE)
+        self.assertEqual(_actions(lexer, 'a1 b a2'), ['A', 'B', 'A'])
+
+    def test_inline_verbose_flag(self):
+        lexer = MiniLexer({'root': [(r'(?x: a  (\d))', 'A'), (r'b', 'B')]})
+        self.assertEqual(_actions(lexer, 'a1 b a2'), ['A', 'B', 'A'])
+
+    def test_ignorecase(self):
+        lexer = MiniLexer({'root': [(r'ab', 'AB'), (r'c', 'C')]}, re.IGNORECASE)
+        self.assertEqual(_actions(lexer, 'AB x c aB C'), ['AB', 'C', 'AB', 'C'])
+
+
+class TestUnmergedRules(unittest.TestCase):
+
+    def test_backreference(self):
+        lexer = MiniLexer({'root': [(r'x', 'X'), (r"(['\"]).*?\1", 'STR')]})
+        matches = list(lexer.run('x "a\'b" x'))
+        self.assertEqual([action for _, action, _ in matches], ['X', 'STR', 'X'])
+        self.assertEqual(matches[1][2], ('"',))
+
+    def test_duplicate_named_groups(self):
+        lexer = MiniLexer({'root': [(r'(?P<n>\d+)', 'NUM'), (r'#(?P<n>\w+)', 'TAG')]})
+        self.assertEqual(list(lexer.run('12 #ab')),
+                         [((0, 1), 'NUM', ('12',)), ((3, 5), 'TAG', ('ab',))])
+
+    def test_inline_global_flags(self):
+        lexer = MiniLexer({'root': [(r'(?x) a  (\d)', 'A'), (r'b', 'B')]})
+        self.assertEqual(_actions(lexer, 'a1 b a2'), ['A', 'B', 'A'])
+
+    def test_first_rule_wins(self):
+        lexer = MiniLexer({'root': [(r'(?P<kw>if)', 'KW'), (r'\w+', 'ID')]})
+        self.assertEqual(_actions(lexer, 'if iffy'), ['KW', 'KW', 'ID'])
+
+    def test_state_change(self):
+        lexer = MiniLexer({
+            'root': [(r'\(', 'OPEN', 'inner'), (r'\w+', 'ID')],
+            'inner': [(r'(\w)\1', 'PAIR'), (r'\)', 'CLOSE', '#pop')],
+        })
+        self.assertEqual(_actions(lexer, 'a (bb c) d'), ['ID', 'OPEN', 'PAIR', 'CLOSE', 'ID'])
+
+
+if __name__ == '__main__':
+    unittest.main()